@@ -3,9 +3,8 @@ app.py – Entry point: login + sidebar navigation + page routing.
 All page logic lives in app/<page>_page.py modules.
 """
 import streamlit as st
-import pandas as pd
 import time
-from core.database_manager import load_data_from_db, KiranaDatabase
+from core.database_manager import KiranaDatabase
 from app import (
     home_page,
     sales_analysis_page,
@@ -19,6 +18,7 @@ from app import (
     stock_inward_page,
     store_transfer_page
 )
+from app.sales_cache import get_sales_df, invalidate_sales_caches
 
 # ── Config & shared DB instance ───────────────────────────────────────────
 st.set_page_config(page_title="Kirana-Predict Pro", layout="wide", page_icon="📦")
@@ -276,35 +276,32 @@ if not st.session_state.authenticated:
                             st.error(f"❌ {res.get('error', 'Unknown error')}")
     st.stop()
 
-# ── Data loading ──────────────────────────────────────────────────────────
-try:
-    df = load_data_from_db()
-    if df.empty:
-        st.error("❌ No sales data found. Please add data in Supabase.")
-        st.stop()
-except Exception as e:
-    st.error(f"❌ Database error: {e}")
+# ── Refresh helper ───────────────────────────────────────────────────────
+def refresh_button():
+    if st.button("🔃  Refresh Data", use_container_width=True, key="nav_refresh"):
+        invalidate_sales_caches()
+        st.rerun()
+
+def stop_with_error(message: str):
+    # Keep Refresh reachable so a failed load can be retried from the UI
+    st.error(message)
+    with st.sidebar:
+        refresh_button()
     st.stop()
 
-# Date normalisation
+# ── Data loading ──────────────────────────────────────────────────────────
 try:
-    if 'transaction_date' in df.columns:
-        df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-    elif 'created_at' in df.columns:
-        df['transaction_date'] = pd.to_datetime(df['created_at'])
-    else:
-        raise KeyError(f"No date column. Columns: {list(df.columns)}")
+    # Shallow copy: pages may add or reassign columns without touching the shared frame
+    df = get_sales_df().copy(deep=False)
+except KeyError as e:
+    stop_with_error(f"❌ Date conversion error: {e}")
 except Exception as e:
-    st.error(f"❌ Date conversion error: {e}")
-    st.stop()
+    stop_with_error(f"❌ Database error: {e}")
 
-# Optional column defaults
-if 'store_name'  not in df.columns: df['store_name']  = 'Main Store'
-if 'data_source' not in df.columns: df['data_source'] = 'manual'
-if 'total_amount' not in df.columns and {'quantity', 'unit_price'}.issubset(df.columns):
-    df['total_amount'] = df['quantity'] * df['unit_price']
-if 'transaction_id' not in df.columns:
-    df['transaction_id'] = [f"TXN_AUTO_{i+1}" for i in range(len(df))]
+if df.empty:
+    # get_all_sales also returns an empty frame on errors; don't share it for the TTL
+    get_sales_df.clear()
+    stop_with_error("❌ No sales data found. Please add data in Supabase.")
 
 # ── Navigation helpers ───────────────────────────────────────────────────
 def ch_page(name: str):
@@ -388,6 +385,8 @@ with st.sidebar:
 
     st.markdown("---")
 
+    refresh_button()
+
     if st.button("🚪  Sign Out", use_container_width=True, key="nav_logout"):
         _logout = True
 
@@ -413,14 +412,14 @@ if page == 'Home':
 
 elif page == 'Sales Analysis':
     require_admin()
-    sales_analysis_page.render(df)
+    sales_analysis_page.render(df, db)
 
 elif page == 'Advanced Analytics':
     require_admin()
     advanced_analytics_page.render(df)
 
 elif page == 'Inventory Forecast':
-    forecasting_page.render(df)
+    forecasting_page.render(df, db)
 
 elif page == 'Product Comparison':
     require_admin()
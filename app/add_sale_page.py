@@ -5,6 +5,7 @@ Accessible to all logged-in users (Admin and Staff).
 import streamlit as st
 import pandas as pd
 import time
+from app.sales_cache import invalidate_sales_caches
 from core.database_manager import KiranaDatabase
 
 
@@ -53,6 +54,8 @@ def render(df: pd.DataFrame, db: KiranaDatabase):
                     }
 
                     db.add_sale(sale_data, source='manual_entry')
+                    # Drop the cached page queries and the shared sales frame so the new row shows up
+                    invalidate_sales_caches()
                     st.success(f"✅ Sale of {quantity} x {product_name} recorded successfully!")
                     st.balloons()
                     time.sleep(1.5)
@@ -4,7 +4,7 @@ app/advanced_analytics_page.py – Advanced Analytics Dashboard.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from app.utils import export_to_csv
+from app.utils import export_to_csv, slice_date_range
 
 
 def render(df: pd.DataFrame):
@@ -29,7 +29,7 @@ def render(df: pd.DataFrame):
 
     start_date_an = pd.to_datetime(analytics_date_range[0])
     end_date_an = pd.to_datetime(analytics_date_range[1])
-    df_analytics = df[(df['transaction_date'] >= start_date_an) & (df['transaction_date'] <= end_date_an)].copy()
+    df_analytics = slice_date_range(df, start_date_an, end_date_an).copy()
 
     if df_analytics.empty:
         st.warning("⚠️ No data in selected period")
@@ -97,17 +97,17 @@ def render(df: pd.DataFrame):
     st.subheader("🏆 Product Performance Analysis")
 
     perf_col1, perf_col2 = st.columns(2)
-    product_revenue = df_analytics.groupby('product_name')['total_amount'].sum().sort_values(ascending=False)
+    product_revenue = df_analytics.groupby('product_name', observed=True, sort=False)['total_amount'].sum()
 
     with perf_col1:
-        top_5 = product_revenue.head(5)
+        top_5 = product_revenue.nlargest(5)
         fig_top5 = px.bar(x=top_5.values, y=top_5.index, orientation='h', title='Top 5 Products by Revenue',
                           color=top_5.values, color_continuous_scale='Greens')
         fig_top5.update_layout(xaxis_title='Revenue (₹)', yaxis_title='', showlegend=False, height=300)
         st.plotly_chart(fig_top5, use_container_width=True)
 
     with perf_col2:
-        bottom_5 = product_revenue.tail(5).sort_values()
+        bottom_5 = product_revenue.nsmallest(5)
         fig_bottom5 = px.bar(x=bottom_5.values, y=bottom_5.index, orientation='h', title='Bottom 5 Products by Revenue',
                              color=bottom_5.values, color_continuous_scale='Reds')
         fig_bottom5.update_layout(xaxis_title='Revenue (₹)', yaxis_title='', showlegend=False, height=300)
@@ -120,7 +120,7 @@ def render(df: pd.DataFrame):
     dist_col1, dist_col2 = st.columns([1.5, 1])
 
     with dist_col1:
-        product_quantity = df_analytics.groupby('product_name')['quantity'].sum().head(8)
+        product_quantity = df_analytics.groupby('product_name', observed=True)['quantity'].sum().head(8)
         fig_pie = px.pie(values=product_quantity.values, names=product_quantity.index,
                          title='Product Sales Distribution (Top 8)', hole=0.4)
         fig_pie.update_traces(textposition='inside', textinfo='percent+label')
@@ -199,7 +199,7 @@ def render(df: pd.DataFrame):
         'Value': [
             f"₹{total_revenue:,.2f}", total_transactions, total_units, unique_products,
             f"₹{avg_transaction:.2f}",
-            df_analytics.groupby('product_name')['quantity'].sum().idxmax(),
+            df_analytics.groupby('product_name', observed=True)['quantity'].sum().idxmax(),
             product_revenue.idxmax(),
             f"{start_date_an.strftime('%d %b %Y')} - {end_date_an.strftime('%d %b %Y')}"
         ]
@@ -212,7 +212,7 @@ def render(df: pd.DataFrame):
 
     with export_col2:
         product_perf_csv, product_perf_name = export_to_csv(
-            df_analytics.groupby('product_name').agg({
+            df_analytics.groupby('product_name', observed=True).agg({
                 'quantity': 'sum', 'total_amount': 'sum', 'transaction_id': 'count'
             }).reset_index(), "product_performance"
         )
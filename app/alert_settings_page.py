@@ -4,6 +4,7 @@ app/alert_settings_page.py – Email Alert Configuration and Testing page.
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+from core.aggregations import product_stats
 from core.email_manager import EmailAlertManager
 
 
@@ -142,23 +143,21 @@ EMAIL_RECIPIENTS = "recipient@email.com"
 
         if st.button("🔍 Check Inventory & Send Alerts", type="primary", use_container_width=True):
             with st.spinner('Analyzing inventory...'):
-                inventory_alerts = []
-
-                for product in df['product_name'].unique():
-                    product_df = df[df['product_name'] == product]
-                    cutoff_date = datetime.now() - timedelta(days=lookback_days)
-                    recent = product_df[product_df['transaction_date'] >= cutoff_date]
-
-                    if not recent.empty:
-                        avg_daily = recent['quantity'].sum() / recent['transaction_date'].nunique()
-                        current_stock = int(avg_daily * 30)
-                        days_remaining = current_stock / avg_daily if avg_daily > 0 else 999
-
-                        if days_remaining < 7:
-                            inventory_alerts.append({
-                                'product_name': product, 'current_stock': current_stock,
-                                'days_remaining': days_remaining, 'avg_daily_sales': avg_daily
-                            })
+                cutoff_date = datetime.now() - timedelta(days=lookback_days)
+                recent = df[df['transaction_date'] >= cutoff_date]
+
+                # One grouped pass over the lookback window instead of a mask per product
+                stock = product_stats(recent)
+                stock['avg_daily_sales'] = stock['total'] / stock['days']
+                stock['current_stock'] = (stock['avg_daily_sales'] * 30).astype(int)
+                stock['days_remaining'] = (stock['current_stock'] / stock['avg_daily_sales']).where(
+                    stock['avg_daily_sales'] > 0, 999
+                )
+
+                low = stock[stock['days_remaining'] < 7]
+                inventory_alerts = low.reset_index()[
+                    ['product_name', 'current_stock', 'days_remaining', 'avg_daily_sales']
+                ].to_dict('records')
 
                 if inventory_alerts:
                     st.warning(f"⚠️ Found {len(inventory_alerts)} product(s) with low stock!")
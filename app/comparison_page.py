@@ -4,7 +4,7 @@ app/comparison_page.py – Multi-product comparison page.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from app.utils import export_to_csv
+from app.utils import export_to_csv, slice_date_range
 
 
 def render(df: pd.DataFrame):
@@ -66,11 +66,8 @@ def render(df: pd.DataFrame):
     start_date_comp = pd.to_datetime(comparison_dates[0])
     end_date_comp = pd.to_datetime(comparison_dates[1])
 
-    comparison_df = df[
-        (df['product_name'].isin(selected_products)) &
-        (df['transaction_date'] >= start_date_comp) &
-        (df['transaction_date'] <= end_date_comp)
-    ]
+    comparison_df = slice_date_range(df, start_date_comp, end_date_comp)
+    comparison_df = comparison_df[comparison_df['product_name'].isin(selected_products)]
 
     if comparison_df.empty:
         st.warning("⚠️ No sales data found for selected products in this period")
@@ -98,7 +95,7 @@ def render(df: pd.DataFrame):
     st.markdown("---")
     st.subheader("💰 Revenue Comparison")
 
-    revenue_comparison = comparison_df.groupby('product_name')['total_amount'].sum().sort_values(ascending=False)
+    revenue_comparison = comparison_df.groupby('product_name', observed=True)['total_amount'].sum().sort_values(ascending=False)
     fig_revenue_comp = px.bar(x=revenue_comparison.index, y=revenue_comparison.values, title='Total Revenue by Product',
                               color=revenue_comparison.values, color_continuous_scale='Blues',
                               labels={'x': 'Product', 'y': 'Revenue (₹)'})
@@ -114,7 +111,7 @@ def render(df: pd.DataFrame):
     st.subheader("📈 Sales Trends Over Time")
 
     daily_comparison = comparison_df.groupby(
-        [comparison_df['transaction_date'].dt.date, 'product_name']
+        [comparison_df['transaction_date'].dt.date, 'product_name'], observed=True
     )['quantity'].sum().reset_index()
     daily_comparison.columns = ['Date', 'Product', 'Quantity']
     daily_comparison['Date'] = pd.to_datetime(daily_comparison['Date'])
@@ -131,7 +128,7 @@ def render(df: pd.DataFrame):
     col_units1, col_units2 = st.columns([1.5, 1])
 
     with col_units1:
-        units_comparison = comparison_df.groupby('product_name')['quantity'].sum().sort_values(ascending=False)
+        units_comparison = comparison_df.groupby('product_name', observed=True)['quantity'].sum().sort_values(ascending=False)
         fig_units = px.bar(x=units_comparison.index, y=units_comparison.values, title='Total Units Sold',
                            color=units_comparison.values, color_continuous_scale='Greens',
                            labels={'x': 'Product', 'y': 'Units Sold'})
@@ -180,7 +177,7 @@ def render(df: pd.DataFrame):
     st.markdown("---")
     st.subheader("💵 Price Analysis")
 
-    price_comparison = comparison_df.groupby('product_name')['unit_price'].agg(['mean', 'min', 'max']).round(2)
+    price_comparison = comparison_df.groupby('product_name', observed=True)['unit_price'].agg(['mean', 'min', 'max']).round(2)
     price_comparison.columns = ['Average Price', 'Min Price', 'Max Price']
     price_comparison = price_comparison.reset_index()
     price_comparison.columns = ['Product', 'Avg Price (₹)', 'Min Price (₹)', 'Max Price (₹)']
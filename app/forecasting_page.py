@@ -6,13 +6,57 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime
+from app.sales_cache import list_products, load_product_history
 from app.utils import export_to_csv, export_to_excel
-from core.ml_engine import predict_future_demand
+from core.aggregations import count_active_days, daily_quantity
+from core.database_manager import KiranaDatabase
+from core.ml_engine import predict_future_demand, predict_future_demand_batch
 
 
-def render(df: pd.DataFrame):
+def _render_outlook(df: pd.DataFrame):
+    """Linear-trend 7-day outlook for every product, fitted in one batch pass."""
+    with st.expander("📋 All Products – 7-Day Trend Outlook"):
+        st.caption("Quick linear-trend estimate per product; use the AI forecast below for detail.")
+
+        sold_days_only = st.checkbox(
+            "Fit on sold days only",
+            key="outlook_sold_days_only",
+            help="Ignore days with no sales instead of counting them as zero"
+        )
+
+        if not st.button("📋 Build Outlook", key="outlook_build"):
+            return
+
+        forecast, r2 = predict_future_demand_batch(df, fill_gaps=not sold_days_only)
+        if forecast is None:
+            st.warning("⚠️ Not enough sales history to build an outlook.")
+            return
+
+        outlook = forecast.groupby('product_name', observed=True, as_index=False)['Predicted_Sales'].sum()
+        # float32 sums print as e.g. 38.700001; keep the forecast's one decimal
+        outlook['Predicted_Sales'] = outlook['Predicted_Sales'].astype('float64').round(1)
+        outlook['Trend_R2'] = outlook['product_name'].map(r2).astype(float).round(2)
+        outlook = outlook.rename(columns={
+            'product_name': 'Product', 'Predicted_Sales': 'Predicted_7_Days'
+        }).sort_values('Predicted_7_Days', ascending=False)
+
+        st.dataframe(outlook, use_container_width=True, hide_index=True, height=320)
+
+        outlook_csv, outlook_csv_filename = export_to_csv(outlook, "trend_outlook")
+        st.download_button(
+            label="📥 Download Outlook (CSV)",
+            data=outlook_csv,
+            file_name=outlook_csv_filename,
+            mime="text/csv",
+            use_container_width=True
+        )
+
+
+def render(df: pd.DataFrame, db: KiranaDatabase):
     st.title("🔮 Smart Inventory Forecaster")
 
+    _render_outlook(df)
+
     # ── Product selection ──────────────────────────────────────────────────
     st.subheader("🔍 Select Product")
 
@@ -25,7 +69,10 @@ def render(df: pd.DataFrame):
             key="product_search_forecast"
         )
 
-    all_products_forecast = sorted(df['product_name'].unique().tolist())
+    # Catalogue plus every product seen in sales (webhook/watchdog sales may
+    # name products the catalogue doesn't list)
+    sold_products = set(df['product_name'].unique())
+    all_products_forecast = sorted(sold_products.union(list_products(db)))
 
     if product_search:
         filtered_products = [p for p in all_products_forecast if product_search.lower() in p.lower()]
@@ -35,16 +82,26 @@ def render(df: pd.DataFrame):
     else:
         filtered_products = all_products_forecast
 
+    # Catalogue products may have no sales yet; open on the first one that does
+    default_index = next(
+        (i for i, p in enumerate(filtered_products) if p in sold_products), 0
+    )
+
     with select_col:
         st.caption(f"📦 {len(filtered_products)} product(s) available")
         item = st.selectbox(
             "Choose Product:",
             filtered_products,
+            index=default_index,
             key="product_select_forecast"
         )
 
     # ── Filter data for selected product ───────────────────────────────────
-    item_data = df[df['product_name'] == item].copy()
+    try:
+        item_data = load_product_history(db, item)
+    except Exception as e:
+        st.error(f"❌ Database error: {e}")
+        return
 
     if item_data.empty:
         st.error(f"❌ No sales data found for '{item}'")
@@ -69,7 +126,10 @@ def render(df: pd.DataFrame):
         st.info("💡 Try increasing the lookback period or select a different product.")
         return
 
-    avg_sales = recent_data['quantity'].sum() / recent_data['transaction_date'].nunique()
+    # One daily series feeds both the average and the trend chart
+    daily_sales = daily_quantity(recent_data['transaction_date'], recent_data['quantity'])
+    active_days = daily_sales[daily_sales > 0]
+    avg_sales = active_days.mean() if not active_days.empty else 0
     days_left = stock / avg_sales if avg_sales > 0 else 0
 
     # ── Key metrics ────────────────────────────────────────────────────────
@@ -89,11 +149,9 @@ def render(df: pd.DataFrame):
     st.markdown("---")
     st.subheader("📊 Historical Sales Trend")
 
-    daily_sales = recent_data.groupby('transaction_date')['quantity'].sum().reset_index()
-
     if not daily_sales.empty:
         fig_trend = px.line(
-            daily_sales,
+            daily_sales.reset_index(),
             x='transaction_date',
             y='quantity',
             title=f"{item} – Sales Trend (Last {days_to_consider} Days)",
@@ -107,7 +165,7 @@ def render(df: pd.DataFrame):
     st.markdown("---")
     st.subheader("🚀 AI-Powered 7-Day Forecast")
 
-    unique_days = item_data['transaction_date'].nunique()
+    unique_days = count_active_days(item_data['transaction_date'])
     total_records = len(item_data)
 
     col_info1, col_info2 = st.columns(2)
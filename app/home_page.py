@@ -3,7 +3,7 @@ app/home_page.py – Home dashboard with KPI metrics, quick actions, and recent
 """
 import streamlit as st
 import pandas as pd
-from app.utils import export_to_csv, export_to_excel
+from app.utils import export_to_csv, export_to_excel, slice_date_range
 
 
 def render(df: pd.DataFrame, ch_page):
@@ -24,9 +24,9 @@ def render(df: pd.DataFrame, ch_page):
 
     # Period comparison (last 30 vs previous 30 days)
     today = df['transaction_date'].max()
-    last_30  = df[df['transaction_date'] >= today - pd.Timedelta(days=30)]
-    prev_30  = df[(df['transaction_date'] >= today - pd.Timedelta(days=60)) &
-                  (df['transaction_date'] <  today - pd.Timedelta(days=30))]
+    last_30  = slice_date_range(df, today - pd.Timedelta(days=30), today)
+    prev_30  = slice_date_range(df, today - pd.Timedelta(days=60),
+                                today - pd.Timedelta(days=30), include_end=False)
     vol_delta = None
     if not prev_30.empty:
         pct = ((last_30['quantity'].sum() - prev_30['quantity'].sum()) /
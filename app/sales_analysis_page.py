@@ -4,10 +4,12 @@ app/sales_analysis_page.py – Sales Analysis page with filters, charts, and exp
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from app.sales_cache import load_sales_window, load_top_products
 from app.utils import export_to_csv
+from core.database_manager import KiranaDatabase
 
 
-def render(df: pd.DataFrame):
+def render(df: pd.DataFrame, db: KiranaDatabase):
     st.title("📊 Sales Insights")
 
     # Filter section
@@ -59,12 +61,13 @@ def render(df: pd.DataFrame):
             st.stop()
 
         start_date, end_date = pd.to_datetime(date_range[0]), pd.to_datetime(date_range[1])
-        filtered_df = df[(df['transaction_date'] >= start_date) & (df['transaction_date'] <= end_date)]
-
-        if selected_products:
-            filtered_df = filtered_df[filtered_df['product_name'].isin(selected_products)]
+        try:
+            filtered_df = load_sales_window(db, start_date, end_date, tuple(selected_products))
+        except Exception as e:
+            st.error(f"❌ Database error: {e}")
+            st.stop()
 
-        if selected_store_analysis != 'All Stores':
+        if selected_store_analysis != 'All Stores' and not filtered_df.empty:
             filtered_df = filtered_df[filtered_df['store_name'] == selected_store_analysis]
 
         sort_column, sort_ascending = sort_options[selected_sort]
@@ -81,7 +84,12 @@ def render(df: pd.DataFrame):
             f"Total: **₹{filtered_df['total_amount'].sum():,.2f}**"
         )
 
-        top_items = filtered_df.groupby('product_name')['quantity'].sum().sort_values(ascending=False).head(10)
+        top_items = load_top_products(
+            db, start_date, end_date, tuple(selected_products),
+            None if selected_store_analysis == 'All Stores' else selected_store_analysis
+        )
+        if top_items is None:
+            top_items = filtered_df.groupby('product_name', observed=True, sort=False)['quantity'].sum().nlargest(10)
 
         if not top_items.empty:
             col_chart, col_data = st.columns([2, 1])
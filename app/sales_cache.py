@@ -0,0 +1,84 @@
+"""
+app/sales_cache.py – Cached sales loaders shared by app.py and the pages.
+Kept in one module so Refresh and new sales can drop exactly these caches
+(not every st.cache_resource, which would also discard the Supabase client).
+"""
+import streamlit as st
+import pandas as pd
+from core.database_manager import KiranaDatabase, clear_sales_snapshot, load_data_from_db
+
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def get_sales_df() -> pd.DataFrame:
+    """
+    Load and normalise sales once per TTL window; widget reruns reuse it.
+    Held as a shared resource (no pickling or hashing on each hit), so
+    callers must not modify it in place.
+    """
+    df = load_data_from_db()
+    if df.empty:
+        return df
+    return _normalise_sales(df)
+
+
+def _normalise_sales(df: pd.DataFrame) -> pd.DataFrame:
+    """Date column, date order and optional-column defaults the pages rely on."""
+    # Date normalisation (get_all_sales already parses transaction_date)
+    if 'transaction_date' not in df.columns:
+        if 'created_at' not in df.columns:
+            raise KeyError(f"No date column. Columns: {list(df.columns)}")
+        df['transaction_date'] = pd.to_datetime(df['created_at'])
+
+    # Pages slice date ranges with a binary search, so keep rows in date order
+    if not df['transaction_date'].is_monotonic_increasing:
+        df = df.sort_values('transaction_date', kind='stable', ignore_index=True)
+
+    # Optional column defaults
+    if 'store_name'  not in df.columns: df['store_name']  = 'Main Store'
+    if 'data_source' not in df.columns: df['data_source'] = 'manual'
+    if 'total_amount' not in df.columns and {'quantity', 'unit_price'}.issubset(df.columns):
+        df['total_amount'] = df['quantity'] * df['unit_price']
+    if 'transaction_id' not in df.columns:
+        df['transaction_id'] = [f"TXN_AUTO_{i+1}" for i in range(len(df))]
+    return df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_sales_window(_db: KiranaDatabase, start_date, end_date, products: tuple) -> pd.DataFrame:
+    """
+    Fetch only the selected window (and products) from Supabase, cached per
+    filter. Query errors propagate, so a failed fetch is not cached.
+    """
+    df = _db.get_sales_between(start_date, end_date, list(products) or None)
+    if df.empty:
+        return df
+    return _normalise_sales(df)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_top_products(_db: KiranaDatabase, start_date, end_date, products: tuple, store_name):
+    """Top-10 products aggregated server-side; None when the RPC isn't installed."""
+    return _db.get_top_products(start_date, end_date, k=10,
+                                products=list(products) or None, store_name=store_name)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_product_history(_db: KiranaDatabase, product_name: str) -> pd.DataFrame:
+    """One product's (transaction_date, quantity) rows, fetched server-side and cached (errors propagate uncached)."""
+    return _db.get_product_sales(product_name)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def list_products(_db: KiranaDatabase) -> list:
+    """Product names for the selector, read once from the products table."""
+    return _db.get_product_names()
+
+
+def invalidate_sales_caches() -> None:
+    """Drop every cached sales query (and the disk snapshot) so the next rerun sees current data."""
+    clear_sales_snapshot()
+    get_sales_df.clear()
+    load_sales_window.clear()
+    load_top_products.clear()
+    load_product_history.clear()
+    list_products.clear()
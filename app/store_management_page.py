@@ -216,21 +216,25 @@ def render(db: KiranaDatabase):
                     active_stores['store_name'].isin(selected_stores)
                 ]['store_code'].tolist()
 
-                comparison_data = []
-                for code in selected_codes:
-                    store_sales = db.get_sales_by_store(code)
-                    if not store_sales.empty:
-                        comparison_data.append({
-                            'store_code': code,
-                            'store_name': active_stores[active_stores['store_code'] == code].iloc[0]['store_name'],
-                            'total_revenue': store_sales['total_amount'].sum(),
-                            'total_quantity': store_sales['quantity'].sum(),
-                            'transactions': len(store_sales),
-                            'unique_products': store_sales['product_name'].nunique()
-                        })
-
-                if comparison_data:
-                    comp_df = pd.DataFrame(comparison_data)
+                # One query for all selected stores, one grouped pass for every metric
+                store_sales = db.get_sales_by_store(selected_codes)
+                comp_df = pd.DataFrame()
+                if not store_sales.empty:
+                    comp_df = store_sales.groupby('store_code', sort=False).agg(
+                        total_revenue=('total_amount', 'sum'),
+                        total_quantity=('quantity', 'sum'),
+                        transactions=('quantity', 'size'),
+                        unique_products=('product_name', 'nunique')
+                    )
+                    comp_df = comp_df.reindex(
+                        [c for c in selected_codes if c in comp_df.index]
+                    ).rename_axis('store_code').reset_index()
+                    comp_df = comp_df.merge(
+                        active_stores[['store_code', 'store_name']].drop_duplicates('store_code'),
+                        on='store_code', how='left'
+                    )
+
+                if not comp_df.empty:
                     cols = st.columns(len(selected_stores))
                     for idx, row in comp_df.iterrows():
                         with cols[idx]:
@@ -1,5 +1,5 @@
 """
-app/utils.py – Shared export helpers used across all pages.
+app/utils.py – Shared export and filtering helpers used across all pages.
 """
 import io
 import pandas as pd
@@ -21,3 +21,15 @@ def export_to_excel(dataframe: pd.DataFrame, filename_prefix: str):
         dataframe.to_excel(writer, index=False, sheet_name='Data')
     output.seek(0)
     return output.getvalue(), f"{filename_prefix}_{timestamp}.xlsx"
+
+
+def slice_date_range(dataframe: pd.DataFrame, start, end, column: str = 'transaction_date',
+                     include_end: bool = True):
+    """
+    Rows with start <= column <= end (column < end when include_end is False).
+    The frame must already be sorted by column.
+    """
+    dates = dataframe[column]
+    lo = dates.searchsorted(start, side='left')
+    hi = dates.searchsorted(end, side='right' if include_end else 'left')
+    return dataframe.iloc[lo:hi]
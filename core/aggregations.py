@@ -0,0 +1,168 @@
+"""
+core/aggregations.py - Fast numeric kernels for sales aggregation
+Daily bucketing and the 1-D trend fit used by the forecasts. Uses Numba when it is installed
+(optional, `pip install numba`) and ``np.bincount`` otherwise. Per-product
+stats on very large frames run in DuckDB when available (`pip install duckdb`).
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+NS_PER_DAY = 86_400_000_000_000
+
+# Below this many rows pandas beats DuckDB's registration/query overhead
+DUCKDB_MIN_ROWS = 1_000_000
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _daily_sum_kernel(ts_ns, qty, t0, out):
+        """Accumulate qty into out[day], where day counts whole days since t0."""
+        for i in range(ts_ns.size):
+            out[(ts_ns[i] - t0) // NS_PER_DAY] += qty[i]
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _ols_moments_kernel(x, y):
+        """One streaming (Welford) pass: means and centred sums of squares/products."""
+        mx = 0.0
+        my = 0.0
+        cxx = 0.0
+        cxy = 0.0
+        cyy = 0.0
+        for i in range(x.size):
+            n = i + 1
+            dx = x[i] - mx
+            dy = y[i] - my
+            mx += dx / n
+            my += dy / n
+            cxx += dx * (x[i] - mx)
+            cxy += dx * (y[i] - my)
+            cyy += dy * (y[i] - my)
+        return mx, my, cxx, cxy, cyy
+
+
+def _ols_moments(x: np.ndarray, y: np.ndarray):
+    """Means and centred sums (Sxx, Sxy, Syy) of two equal-length arrays."""
+    if NUMBA_AVAILABLE:
+        return _ols_moments_kernel(x, y)
+    mx, my = x.mean(dtype=np.float64), y.mean(dtype=np.float64)
+    dx, dy = x - mx, y - my
+    return mx, my, float((dx * dx).sum()), float((dx * dy).sum()), float((dy * dy).sum())
+
+
+def linear_fit(x: np.ndarray, y: np.ndarray):
+    """
+    Closed-form 1-D least squares. Returns ``(slope, intercept, r2)`` with the
+    same conventions as sklearn's LinearRegression + r2_score (flat fit when x
+    is constant; r2 of 1.0/0.0 when y is constant).
+    """
+    mx, my, sxx, sxy, syy = _ols_moments(x, y)
+    slope = sxy / sxx if sxx > 0 else 0.0
+    intercept = my - slope * mx
+
+    ss_res = max(syy - slope * sxy, 0.0)
+    if syy > 0:
+        r2 = 1 - ss_res / syy
+    else:
+        r2 = 1.0 if ss_res == 0 else 0.0
+    return slope, intercept, r2
+
+
+def _wall_clock_ns(dates: pd.Series) -> np.ndarray:
+    """int64 nanoseconds of local wall-clock time, so day buckets match what users see."""
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.values.astype('datetime64[ns]').view('i8')
+
+
+def count_active_days(dates: pd.Series) -> int:
+    """Number of distinct calendar days in ``dates`` (integer buckets, no Timestamp hashing)."""
+    if dates.empty:
+        return 0
+    return int(np.unique(_wall_clock_ns(dates) // NS_PER_DAY).size)
+
+
+def daily_quantity(dates: pd.Series, quantities: pd.Series) -> pd.Series:
+    """
+    Total quantity per calendar day from the first to the last date, with
+    zero-sales days filled in (same result as ``resample('D').sum()``).
+
+    Returns a Series named after ``quantities`` with a DatetimeIndex named
+    after ``dates``, so ``.reset_index()`` keeps the original column names.
+    """
+    name = quantities.name or 'quantity'
+    index_name = dates.name or 'transaction_date'
+
+    if dates.empty:
+        return pd.Series(dtype='int64', name=name,
+                         index=pd.DatetimeIndex([], name=index_name))
+
+    tz = dates.dt.tz
+    ts_ns = _wall_clock_ns(dates)
+
+    qty = quantities.to_numpy()
+    integral = np.issubdtype(qty.dtype, np.integer)
+    if integral:
+        qty = qty.astype(np.int64, copy=False)
+    else:
+        qty = np.nan_to_num(qty.astype(np.float64, copy=False))
+
+    t0 = (ts_ns.min() // NS_PER_DAY) * NS_PER_DAY
+    ndays = int((ts_ns.max() - t0) // NS_PER_DAY) + 1
+
+    if NUMBA_AVAILABLE:
+        totals = _daily_sum_kernel(ts_ns, qty, t0, np.zeros(ndays, dtype=qty.dtype))
+    else:
+        # bincount sums float64 weights; exact for integer sales quantities
+        day_idx = ((ts_ns - t0) // NS_PER_DAY).astype(np.intp)
+        totals = np.bincount(day_idx, weights=qty, minlength=ndays)
+        if integral:
+            totals = totals.astype(np.int64)
+
+    index = pd.date_range(pd.Timestamp(t0), periods=ndays, freq='D', tz=tz, name=index_name)
+    return pd.Series(totals, index=index, name=name)
+
+
+def product_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Total quantity and number of distinct transaction dates per product,
+    indexed by product_name (columns ``total`` and ``days``). Large frames are
+    aggregated by DuckDB's multi-threaded GROUP BY, smaller ones by pandas.
+    """
+    integral = pd.api.types.is_integer_dtype(df['quantity'])
+    if DUCKDB_AVAILABLE and len(df) >= DUCKDB_MIN_ROWS:
+        con = duckdb.connect()
+        try:
+            con.register('sales', df[['product_name', 'quantity', 'transaction_date']])
+            # sum() over integers is HUGEINT, which .df() turns into float64;
+            # cast back so the dtype matches the pandas path (int64)
+            total = "sum(quantity)"
+            if integral:
+                total += "::BIGINT"
+            stats = con.execute(
+                f"select product_name, {total} as total, "
+                "count(distinct transaction_date) as days "
+                "from sales group by product_name"
+            ).df()
+        finally:
+            con.close()
+        return stats.set_index('product_name')
+
+    stats = df.groupby('product_name', observed=True, sort=False).agg(
+        total=('quantity', 'sum'), days=('transaction_date', 'nunique')
+    )
+    # Sums of the downcast (int8/int16) quantity keep that dtype; widen them
+    return stats.astype({'total': 'int64'}) if integral else stats
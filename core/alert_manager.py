@@ -81,16 +81,15 @@ class AlertManager:
                         </tr>
             """
             
-            for _, item in urgent_items.iterrows():
-                html += f"""
+            html += "".join(f"""
                         <tr>
-                            <td><strong>{item['product_name']}</strong></td>
-                            <td>{item['current_stock']} units</td>
-                            <td>{item['days_until_stockout']} days</td>
-                            <td>{item['suggested_order_qty']} units</td>
-                            <td>₹{item['order_cost_estimate']:,.2f}</td>
+                            <td><strong>{item.product_name}</strong></td>
+                            <td>{item.current_stock} units</td>
+                            <td>{item.days_until_stockout} days</td>
+                            <td>{item.suggested_order_qty} units</td>
+                            <td>₹{item.order_cost_estimate:,.2f}</td>
                         </tr>
-                """
+                """ for item in urgent_items.itertuples(index=False))
             
             html += """
                     </table>
@@ -112,15 +111,14 @@ class AlertManager:
                         </tr>
             """
             
-            for _, item in high_items.iterrows():
-                html += f"""
+            html += "".join(f"""
                         <tr>
-                            <td>{item['product_name']}</td>
-                            <td>{item['current_stock']} units</td>
-                            <td>{item['days_until_stockout']} days</td>
-                            <td>{item['suggested_order_qty']} units</td>
+                            <td>{item.product_name}</td>
+                            <td>{item.current_stock} units</td>
+                            <td>{item.days_until_stockout} days</td>
+                            <td>{item.suggested_order_qty} units</td>
                         </tr>
-                """
+                """ for item in high_items.itertuples(index=False))
             
             html += """
                     </table>
@@ -143,32 +141,31 @@ class AlertManager:
                     </tr>
         """
         
-        for _, item in suggestions_df.iterrows():
-            priority_color = {
-                'URGENT': '#f44336',
-                'HIGH': '#ff9800',
-                'MEDIUM': '#ffc107',
-                'LOW': '#4caf50'
-            }.get(item['priority'], '#999')
-            
-            trend_emoji = {
-                'increasing': '📈',
-                'decreasing': '📉',
-                'stable': '➡️'
-            }.get(item['trend'], '❓')
-            
-            html += f"""
+        priority_colors = {
+            'URGENT': '#f44336',
+            'HIGH': '#ff9800',
+            'MEDIUM': '#ffc107',
+            'LOW': '#4caf50'
+        }
+        trend_emojis = {
+            'increasing': '📈',
+            'decreasing': '📉',
+            'stable': '➡️'
+        }
+        
+        # Rows as plain tuples, joined once (iterrows builds a Series per row)
+        html += "".join(f"""
                     <tr>
-                        <td style="color: {priority_color}; font-weight: bold;">{item['priority']}</td>
-                        <td>{item['product_name']}</td>
-                        <td>{item['current_stock']}</td>
-                        <td>{item['daily_consumption']:.1f}</td>
-                        <td>{trend_emoji} {item['trend'].title()}</td>
-                        <td>{item['stockout_date']}</td>
-                        <td><strong>{item['suggested_order_qty']}</strong></td>
-                        <td>₹{item['order_cost_estimate']:,.2f}</td>
+                        <td style="color: {priority_colors.get(item.priority, '#999')}; font-weight: bold;">{item.priority}</td>
+                        <td>{item.product_name}</td>
+                        <td>{item.current_stock}</td>
+                        <td>{item.daily_consumption:.1f}</td>
+                        <td>{trend_emojis.get(item.trend, '❓')} {item.trend.title()}</td>
+                        <td>{item.stockout_date}</td>
+                        <td><strong>{item.suggested_order_qty}</strong></td>
+                        <td>₹{item.order_cost_estimate:,.2f}</td>
                     </tr>
-            """
+            """ for item in suggestions_df.itertuples(index=False))
         
         # Calculate total order cost
         total_cost = suggestions_df['order_cost_estimate'].sum()
@@ -257,15 +254,14 @@ class AlertManager:
                     </tr>
             """
             
-            for _, item in suggestions.head(10).iterrows():
-                html += f"""
+            html += "".join(f"""
                     <tr>
-                        <td>{item['product_name']}</td>
-                        <td>{item['current_stock']}</td>
-                        <td>{item['priority']}</td>
-                        <td>{item['days_until_stockout']}</td>
+                        <td>{item.product_name}</td>
+                        <td>{item.current_stock}</td>
+                        <td>{item.priority}</td>
+                        <td>{item.days_until_stockout}</td>
                     </tr>
-                """
+                """ for item in suggestions.head(10).itertuples(index=False))
             
             html += "</table>"
         else:
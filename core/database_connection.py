@@ -1,6 +1,7 @@
 import os
 import sys
-from typing import Optional, Dict, Any
+import functools
+from typing import Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
@@ -12,6 +13,13 @@ except ImportError:
     STREAMLIT_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=None)
+def _read_env(env_file: str) -> Tuple[Optional[str], Optional[str]]:
+    """Read the .env file once per process; later connections reuse the values."""
+    load_dotenv(env_file)
+    return os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")
+
+
 class SupabaseConnection:
     """
     Manages Supabase database connection with proper error handling.
@@ -56,9 +64,7 @@ class SupabaseConnection:
     
     def _load_from_env(self) -> None:
         """Load credentials from .env file."""
-        load_dotenv(self.env_file)
-        self.url = os.getenv("SUPABASE_URL")
-        self.key = os.getenv("SUPABASE_KEY")
+        self.url, self.key = _read_env(self.env_file)
         print("✅ Credentials loaded from .env file")
     
     def connect(self) -> Client:
@@ -133,8 +139,32 @@ class SupabaseConnection:
 
 _db_connection: Optional[SupabaseConnection] = None
 
+if STREAMLIT_AVAILABLE:
+    @st.cache_resource(show_spinner=False)
+    def _cached_supabase() -> Client:
+        """
+        One Supabase client per Streamlit server process, shared by all sessions.
+        The client keeps its own httpx connection pool, so reusing it avoids
+        re-validating credentials and re-opening HTTPS connections on every rerun.
+        """
+        return SupabaseConnection().get_client()
+
+
+def _in_streamlit_runtime() -> bool:
+    """True when running under `streamlit run` (not the API gateway / scripts)."""
+    if not STREAMLIT_AVAILABLE:
+        return False
+    try:
+        return st.runtime.exists()
+    except Exception:
+        return False
+
+
 def get_supabase_client() -> Client:
     """Get Supabase client (creates connection if needed)."""
+    if _in_streamlit_runtime():
+        return _cached_supabase()
+
     global _db_connection
     if _db_connection is None:
         _db_connection = SupabaseConnection()
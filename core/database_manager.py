@@ -1,13 +1,51 @@
 # database_manager.py - Fixed version for Streamlit Cloud
 
+import os
+import tempfile
+import time
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
+from uuid import uuid4
 try:
     from core.database_connection import get_supabase_client
 except ImportError:
     from database_connection import get_supabase_client
 
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# PostgREST returns at most this many rows per request (Supabase default max-rows)
+PAGE_SIZE = 1000
+
+# Seconds a local Feather snapshot of the sales table stays valid
+# (opt-in via SALES_SNAPSHOT_FILE; matches the dashboard cache TTL)
+SALES_SNAPSHOT_MAX_AGE = 300
+
+# Columns the dashboard pages read from the sales table
+SALES_COLUMNS = (
+    'transaction_id,transaction_date,product_name,quantity,'
+    'unit_price,total_amount,store_code,store_name,data_source'
+)
+
+if PYARROW_AVAILABLE:
+    # Arrow types for every sales column we select. product_name is
+    # dictionary-encoded so to_pandas() returns it as a Categorical.
+    SALES_ARROW_TYPES = {
+        'transaction_id': pa.string(),
+        'transaction_date': pa.string(),
+        'product_name': pa.dictionary(pa.int32(), pa.string()),
+        'quantity': pa.float64(),  # int columns would silently truncate 2.5; downcast later
+        'unit_price': pa.float64(),
+        'total_amount': pa.float64(),
+        'store_code': pa.string(),
+        'store_name': pa.string(),
+        'data_source': pa.string(),
+    }
+
 class KiranaDatabase:
     """
     Universal database manager for Kirana-Predict
@@ -70,32 +108,40 @@ class KiranaDatabase:
             print(f"❌ Error adding sale: {e}")
             raise
     
-    def get_all_sales(self) -> pd.DataFrame:
-        """Get all sales data - FIXED for Streamlit Cloud"""
+    def add_sales(self, rows: List[Dict[str, Any]], source: str = 'manual',
+                  batch_size: int = 500) -> int:
+        """Add many sale transactions, one multi-row insert per batch. Returns rows inserted."""
+        now = datetime.now().isoformat()
+        records = []
+        for row in rows:
+            record = dict(row)
+            record.setdefault('data_source', source)
+            record.setdefault('created_at', now)
+            # uuid rather than a timestamp: a whole batch is built within the same second
+            record.setdefault('transaction_id', f"TXN_{uuid4().hex}")
+            records.append(record)
+        
+        inserted = 0
         try:
-            response = self.supabase.table('sales').select("*").execute()
+            for i in range(0, len(records), batch_size):
+                response = self.supabase.table('sales').insert(records[i:i + batch_size]).execute()
+                inserted += len(response.data) if response.data else 0
+            print(f"✅ Sales added: {inserted} of {len(records)}")
+            return inserted
+        except Exception as e:
+            print(f"❌ Error adding sales batch after {inserted} rows: {e}")
+            raise
+    
+    def get_all_sales(self, columns: str = SALES_COLUMNS) -> pd.DataFrame:
+        """Get all sales data - FIXED for Streamlit Cloud (only ``columns`` are fetched)"""
+        try:
+            rows = self._select_all(columns)
             
-            if not response.data:
+            if not rows:
                 print("⚠️  No data returned from Supabase")
                 return pd.DataFrame()
             
-            df = pd.DataFrame(response.data)
-            
-            if df.empty:
-                print("⚠️  DataFrame is empty")
-                return df
-            
-            # FIX: Handle date conversion with flexible format
-            if 'transaction_date' in df.columns:
-                try:
-                    # Use format='ISO8601' to handle various ISO formats
-                    df['transaction_date'] = pd.to_datetime(df['transaction_date'], format='ISO8601')
-                except Exception as e:
-                    print(f"⚠️  ISO8601 failed, trying mixed format: {e}")
-                    # Fallback to mixed format
-                    df['transaction_date'] = pd.to_datetime(df['transaction_date'], format='mixed')
-            else:
-                print(f"⚠️  'transaction_date' column not found. Available columns: {df.columns.tolist()}")
+            df = self._sales_frame(rows)
             
             print(f"📊 Loaded {len(df)} sales records")
             return df
@@ -104,22 +150,184 @@ class KiranaDatabase:
             print(f"❌ Error loading sales: {e}")
             return pd.DataFrame()
     
+    def get_sales_between(self, start, end, products: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get sales in [start, end] (optionally for some products), filtered by Postgres. Raises on query errors"""
+        try:
+            def filters(query):
+                query = query\
+                    .gte('transaction_date', pd.Timestamp(start).isoformat())\
+                    .lte('transaction_date', pd.Timestamp(end).isoformat())
+                if products:
+                    query = query.in_('product_name', list(products))
+                return query
+            
+            return self._sales_frame(self._select_all(SALES_COLUMNS, filters))
+        except Exception as e:
+            print(f"❌ Error loading sales between {start} and {end}: {e}")
+            raise
+    
+    def get_product_sales(self, product_name: str) -> pd.DataFrame:
+        """Get one product's daily-forecast inputs (date, quantity), filtered by Postgres. Raises on query errors"""
+        try:
+            return self._sales_frame(self._select_all(
+                'transaction_date,quantity', lambda query: query.eq('product_name', product_name)
+            ))
+        except Exception as e:
+            print(f"❌ Error loading sales for {product_name}: {e}")
+            raise
+    
+    def get_top_products(self, start, end, k: int = 5, products: Optional[List[str]] = None,
+                         store_name: Optional[str] = None) -> Optional[pd.Series]:
+        """
+        Top-k products by units sold, aggregated in Postgres (top_products RPC).
+        Returns a Series of quantities indexed by product_name, or None if the
+        RPC is not installed so callers can fall back to pandas.
+        """
+        try:
+            response = self.supabase.rpc('top_products', {
+                'p_start': pd.Timestamp(start).isoformat(),
+                'p_end': pd.Timestamp(end).isoformat(),
+                'k': k,
+                'p_products': list(products) if products else None,
+                'p_store': store_name,
+            }).execute()
+            
+            if not response.data:
+                return pd.Series(dtype='int64', name='quantity')
+            
+            top = pd.DataFrame(response.data).set_index('product_name')['qty']
+            return top.rename('quantity')
+        except Exception as e:
+            print(f"⚠️  top_products RPC unavailable, falling back to pandas: {e}")
+            return None
+    
+    def _select_all(self, columns: str, filters=None, page_size: int = PAGE_SIZE) -> List[Dict]:
+        """
+        Run a sales select page by page with .range() so PostgREST's row cap
+        can't silently truncate it; pages are ordered by date so offsets stay
+        stable. ``filters`` is applied to a fresh builder for every page.
+        
+        If the table lacks one of the named columns (older schemas without
+        store_code, store_name, ...), falls back to select('*') and then to
+        fewer sort keys, like the pre-projection loader did.
+        """
+        attempts = [(columns, ('transaction_date', 'transaction_id'))]
+        if columns != '*':
+            attempts.append(('*', ('transaction_date', 'transaction_id')))
+        attempts += [('*', ('transaction_date',)), ('*', ())]
+        
+        for i, (select_cols, order_by) in enumerate(attempts):
+            try:
+                return self._fetch_pages(select_cols, filters, order_by, page_size)
+            except Exception as e:
+                if i == len(attempts) - 1 or not self._is_missing_column(e):
+                    raise
+                print(f"⚠️  Sales query hit a missing column, retrying more broadly: {e}")
+    
+    def _fetch_pages(self, columns: str, filters, order_by, page_size: int,
+                     table: str = 'sales') -> List[Dict]:
+        """Page through one select (sales by default) until a short or empty batch"""
+        rows: List[Dict] = []
+        offset = 0
+        while True:
+            query = self.supabase.table(table).select(columns)
+            if filters is not None:
+                query = filters(query)
+            for column in order_by:
+                query = query.order(column)
+            batch = query.range(offset, offset + page_size - 1).execute().data
+            if not batch:
+                break
+            rows.extend(batch)
+            if len(batch) < page_size:
+                break
+            offset += page_size
+        return rows
+    
+    @staticmethod
+    def _is_missing_column(error: Exception) -> bool:
+        """True for PostgREST/Postgres "column does not exist" errors (SQLSTATE 42703)"""
+        code = getattr(error, 'code', None)
+        return code == '42703' or ('column' in str(error) and 'does not exist' in str(error))
+    
+    @classmethod
+    def _sales_frame(cls, rows: List[Dict]) -> pd.DataFrame:
+        """
+        Build a sales DataFrame from Supabase rows in one step. With PyArrow the
+        dtypes come from SALES_ARROW_TYPES and transaction_date is parsed by
+        Arrow's ISO8601 cast; otherwise (or on odd data) pandas does the same.
+        """
+        if not rows:
+            return pd.DataFrame()
+        
+        columns = list(rows[0])
+        if PYARROW_AVAILABLE and set(columns) <= set(SALES_ARROW_TYPES):
+            try:
+                schema = pa.schema([(c, SALES_ARROW_TYPES[c]) for c in columns])
+                table = pa.Table.from_pylist(rows, schema=schema)
+                if 'transaction_date' in columns:
+                    i = table.schema.get_field_index('transaction_date')
+                    table = table.set_column(i, 'transaction_date', cls._arrow_timestamps(table['transaction_date']))
+                df = table.to_pandas()
+                if 'transaction_date' in df.columns and \
+                        not pd.api.types.is_datetime64_any_dtype(df['transaction_date']):
+                    df = cls._parse_transaction_dates(df)
+                return cls._compact_dtypes(df)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                print(f"⚠️  Arrow conversion failed, using pandas: {e}")
+        
+        return cls._compact_dtypes(cls._parse_transaction_dates(pd.DataFrame(rows)))
+    
+    @staticmethod
+    def _arrow_timestamps(column):
+        """Cast ISO8601 strings to timestamps (naive, else UTC); unchanged if neither parses"""
+        for target in (pa.timestamp('ns'), pa.timestamp('ns', tz='UTC')):
+            try:
+                return column.cast(target)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+        return column
+    
+    @staticmethod
+    def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Categorical product names and downcast quantities for cheaper groupbys"""
+        if 'product_name' in df.columns:
+            names = df['product_name'].astype('category')
+            # Arrow dictionaries keep first-seen order; sorted categories let
+            # groupby/unique emit product codes in name order without a sort
+            if not names.cat.categories.is_monotonic_increasing:
+                names = names.cat.reorder_categories(names.cat.categories.sort_values())
+            df['product_name'] = names
+        if 'quantity' in df.columns:
+            df['quantity'] = pd.to_numeric(df['quantity'], downcast='integer')
+        return df
+    
+    @staticmethod
+    def _parse_transaction_dates(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert transaction_date to datetime, tolerating mixed ISO formats"""
+        # FIX: Handle date conversion with flexible format
+        if 'transaction_date' in df.columns:
+            try:
+                # Use format='ISO8601' to handle various ISO formats
+                df['transaction_date'] = pd.to_datetime(df['transaction_date'], format='ISO8601')
+            except Exception as e:
+                print(f"⚠️  ISO8601 failed, trying mixed format: {e}")
+                # Fallback to mixed format
+                df['transaction_date'] = pd.to_datetime(df['transaction_date'], format='mixed')
+        else:
+            print(f"⚠️  'transaction_date' column not found. Available columns: {df.columns.tolist()}")
+        return df
+    
     def get_recent_sales(self, days: int = 7) -> pd.DataFrame:
         """Get sales from last N days"""
         start_date = (datetime.now() - timedelta(days=days)).isoformat()
         
         try:
-            response = self.supabase.table('sales')\
-                .select("*")\
-                .gte('transaction_date', start_date)\
-                .order('transaction_date', desc=True)\
-                .execute()
-            
-            df = pd.DataFrame(response.data)
-            if not df.empty and 'transaction_date' in df.columns:
-                df['transaction_date'] = pd.to_datetime(df['transaction_date'], format='ISO8601')
+            rows = self._select_all(
+                SALES_COLUMNS, lambda query: query.gte('transaction_date', start_date)
+            )
             
-            return df
+            return self._sales_frame(rows[::-1])
         except Exception as e:
             print(f"❌ Error loading recent sales: {e}")
             return pd.DataFrame()
@@ -132,6 +340,18 @@ class KiranaDatabase:
         except Exception as e:
             print(f"❌ Error loading products: {e}")
             return pd.DataFrame()
+    
+    def get_product_names(self) -> List[str]:
+        """Get sorted, distinct product names from the products catalogue (empty list on failure)"""
+        try:
+            # Paged like the sales selects: PostgREST caps a single select at PAGE_SIZE rows
+            rows = self._fetch_pages('product_name', None, ('product_name',), PAGE_SIZE,
+                                     table='products')
+            # Rows arrive sorted, so dict.fromkeys drops repeats and keeps the order
+            return list(dict.fromkeys(row['product_name'] for row in rows if row.get('product_name')))
+        except Exception as e:
+            print(f"❌ Error loading product names: {e}")
+            return []
             
     # ============================================
     # STORE MANAGEMENT METHODS (PHASE 3)
@@ -226,18 +446,16 @@ class KiranaDatabase:
             return False
     
     def get_sales_by_store(self, store_code=None):
-        """Get sales filtered by store"""
+        """Get sales filtered by store (a single code or a list of codes)"""
         try:
-            query = self.supabase.table('sales').select('*')
-            if store_code:
-                query = query.eq('store_code', store_code)
-            response = query.execute()
+            def filters(query):
+                if isinstance(store_code, (list, tuple)):
+                    query = query.in_('store_code', list(store_code))
+                elif store_code:
+                    query = query.eq('store_code', store_code)
+                return query
             
-            if response.data:
-                df = pd.DataFrame(response.data)
-                df['transaction_date'] = pd.to_datetime(df['transaction_date'])
-                return df
-            return pd.DataFrame()
+            return self._sales_frame(self._select_all(SALES_COLUMNS, filters))
         except Exception as e:
             print(f"Error fetching sales by store: {e}")
             return pd.DataFrame()
@@ -245,7 +463,7 @@ class KiranaDatabase:
     def get_store_performance(self):
         """Get performance metrics for all stores"""
         try:
-            df = self.get_all_sales()
+            df = self.get_all_sales(columns='transaction_id,store_code,quantity,total_amount')
             if df.empty:
                 return pd.DataFrame()
             
@@ -284,7 +502,7 @@ class KiranaDatabase:
             if df.empty:
                 return pd.DataFrame()
             
-            product_perf = df.groupby('product_name').agg({
+            product_perf = df.groupby('product_name', observed=True).agg({
                 'total_amount': 'sum',  # ✅ FIXED
                 'quantity': 'sum',
                 'transaction_id': 'count'
@@ -330,10 +548,57 @@ def load_data() -> pd.DataFrame:
     db = KiranaDatabase()
     return db.get_all_sales()
 
-def load_data_from_db() -> pd.DataFrame:
-    """Explicit database loader"""
-    db = KiranaDatabase()
-    return db.get_all_sales()
+def load_data_from_db(snapshot_file: Optional[str] = None,
+                      max_age: int = SALES_SNAPSHOT_MAX_AGE) -> pd.DataFrame:
+    """
+    Explicit database loader. If ``snapshot_file`` (or SALES_SNAPSHOT_FILE) is
+    set, a fresh Feather copy of the sales frame is read from disk instead of
+    re-querying Supabase, and rewritten after every database load.
+    """
+    db = KiranaDatabase()  # also loads .env, so SALES_SNAPSHOT_FILE can live there
+    snapshot_file = snapshot_file or os.getenv("SALES_SNAPSHOT_FILE")
+    use_snapshot = bool(snapshot_file) and PYARROW_AVAILABLE
+    
+    if use_snapshot and os.path.exists(snapshot_file) and \
+            time.time() - os.path.getmtime(snapshot_file) < max_age:
+        try:
+            df = pd.read_feather(snapshot_file)
+            print(f"📂 Loaded {len(df)} sales records from snapshot")
+            return df
+        except Exception as e:
+            print(f"⚠️  Could not read sales snapshot, querying database: {e}")
+    
+    df = db.get_all_sales()
+    
+    if use_snapshot and not df.empty:
+        try:
+            # Write a per-process temp file, then rename, so concurrent writers
+            # never collide and readers never see a half-written file
+            snapshot_dir = os.path.dirname(os.path.abspath(snapshot_file))
+            with tempfile.NamedTemporaryFile(dir=snapshot_dir, suffix='.tmp', delete=False) as tmp:
+                tmp_file = tmp.name
+            try:
+                df.to_feather(tmp_file)
+                os.replace(tmp_file, snapshot_file)
+            finally:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+        except Exception as e:
+            print(f"⚠️  Could not write sales snapshot: {e}")
+    return df
+
+def clear_sales_snapshot(snapshot_file: Optional[str] = None) -> None:
+    """Delete the local sales snapshot so the next load hits the database"""
+    snapshot_file = snapshot_file or os.getenv("SALES_SNAPSHOT_FILE")
+    if snapshot_file:
+        try:
+            os.remove(snapshot_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Callers run this after a committed write; a stale snapshot only
+            # lives until SALES_SNAPSHOT_MAX_AGE, so never fail them over it
+            print(f"⚠️  Could not delete sales snapshot: {e}")
 
 
 # ========================================
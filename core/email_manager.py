@@ -233,15 +233,15 @@ class EmailAlertManager:
         total_units = sales_df["quantity"].sum()
 
         top_products = (
-            sales_df.groupby("product_name")["total_amount"]
+            sales_df.groupby("product_name", observed=True, sort=False)["total_amount"]
             .sum()
-            .sort_values(ascending=False)
-            .head(5)
+            .nlargest(5)
         )
 
-        top_products_html = ""
-        for i, (product, revenue) in enumerate(top_products.items(), 1):
-            top_products_html += f"<li><strong>{product}</strong>: ₹{revenue:,.2f}</li>"
+        top_products_html = "".join(
+            f"<li><strong>{product}</strong>: ₹{revenue:,.2f}</li>"
+            for product, revenue in top_products.items()
+        )
 
         html = f"""
         <!DOCTYPE html>
@@ -7,6 +7,11 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from core.aggregations import linear_fit
+except ImportError:
+    from aggregations import linear_fit
+
 def predict_future_demand(item_df, days_to_predict=7):
     """
     Facebook Prophet - Production-grade forecasting
@@ -25,7 +30,7 @@ def predict_future_demand(item_df, days_to_predict=7):
         return None, None
     
     # Prepare data
-    daily_sales = item_df.groupby('transaction_date')['quantity'].sum().reset_index()
+    daily_sales = item_df.groupby('transaction_date', as_index=False, sort=True)['quantity'].sum()
     
     if len(daily_sales) < 2:
         return None, None
@@ -58,10 +63,9 @@ def predict_future_demand(item_df, days_to_predict=7):
         # Extract only future predictions
         future_forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(days_to_predict)
         
-        # Ensure no negative predictions
-        future_forecast['yhat'] = future_forecast['yhat'].apply(lambda x: max(0, x))
-        future_forecast['yhat_lower'] = future_forecast['yhat_lower'].apply(lambda x: max(0, x))
-        future_forecast['yhat_upper'] = future_forecast['yhat_upper'].apply(lambda x: max(0, x))
+        # Ensure no negative predictions (one vectorized clip, no per-row lambdas)
+        bounds = future_forecast[['yhat', 'yhat_lower', 'yhat_upper']].to_numpy()
+        yhat, yhat_lower, yhat_upper = np.maximum(bounds, 0).T
         
         # Calculate accuracy metrics on historical data
         historical_forecast = forecast[['ds', 'yhat']].head(len(prophet_data))
@@ -72,9 +76,9 @@ def predict_future_demand(item_df, days_to_predict=7):
         # Format output
         result_df = pd.DataFrame({
             'Date': future_forecast['ds'].values,
-            'Predicted_Sales': np.round(future_forecast['yhat'].values, 1),
-            'Lower_Bound': np.round(future_forecast['yhat_lower'].values, 1),
-            'Upper_Bound': np.round(future_forecast['yhat_upper'].values, 1)
+            'Predicted_Sales': np.round(yhat, 1),
+            'Lower_Bound': np.round(yhat_lower, 1),
+            'Upper_Bound': np.round(yhat_upper, 1)
         })
         
         metrics = {
@@ -96,42 +100,152 @@ def predict_with_linear_regression(item_df, days_to_predict=7):
     """
     Legacy Linear Regression (for comparison)
     """
-    from sklearn.linear_model import LinearRegression
-    from sklearn.metrics import r2_score
-    
     if len(item_df) < 7:
         return None, None
     
-    daily_sales = item_df.groupby('transaction_date')['quantity'].sum().reset_index()
+    daily_sales = item_df.groupby('transaction_date', as_index=False, sort=True)['quantity'].sum()
     
     if len(daily_sales) < 2:
         return None, None
     
-    daily_sales['date_ordinal'] = daily_sales['transaction_date'].map(pd.Timestamp.toordinal)
+    # Whole days since the epoch in one cast (same day numbering as toordinal,
+    # offset by a constant); tz-aware dates are counted in local time
+    dates = daily_sales['transaction_date']
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    ord_arr = dates.values.astype('datetime64[D]').view('int64')
     
-    X = daily_sales[['date_ordinal']].values
-    y = daily_sales['quantity'].values
+    # Day offsets from the first sale keep x small, so float32 is exact here
+    x = (ord_arr - ord_arr[0]).astype(np.float32)
+    y = daily_sales['quantity'].values.astype(np.float32, copy=False)
     
-    model = LinearRegression()
-    model.fit(X, y)
-    
-    train_predictions = model.predict(X)
-    r2 = r2_score(y, train_predictions)
+    # Closed-form 1-D least squares (same fit as sklearn's LinearRegression)
+    slope, intercept, r2 = linear_fit(x, y)
     
     last_date = daily_sales['transaction_date'].max()
-    future_dates = [last_date + pd.Timedelta(days=i) for i in range(1, days_to_predict + 1)]
-    future_ordinals = np.array([d.toordinal() for d in future_dates]).reshape(-1, 1)
+    future_dates = pd.date_range(last_date + pd.Timedelta(days=1), periods=days_to_predict, freq='D')
+    future_ordinals = x[-1] + np.arange(1, days_to_predict + 1, dtype=np.float32)
     
-    predictions = model.predict(future_ordinals)
-    predictions = np.maximum(predictions, 0)
+    predictions = np.maximum(slope * future_ordinals + intercept, 0)
     
     forecast_df = pd.DataFrame({
         'Date': future_dates,
-        'Predicted_Sales': np.round(predictions, 1)
+        'Predicted_Sales': predictions.round(1).astype(np.float32, copy=False)
     })
     
-    return forecast_df, r2
+    return forecast_df, float(r2)
+
 
+def _dense_trends(codes, offsets, qty, n_products, ndays):
+    """Per-product OLS over a zero-filled (products x days) matrix"""
+    cells = codes * ndays + offsets
+    mat = np.bincount(cells, weights=qty, minlength=n_products * ndays).reshape(n_products, ndays)
+    # Daily totals fit comfortably in float32; halves the bytes the reductions stream
+    mat = mat.astype(np.float32)
+    
+    # x is shared by every row, so its moments are computed once
+    x = np.arange(ndays, dtype=np.float32)
+    dx = x - x.mean()
+    dy = mat - mat.mean(axis=1, keepdims=True)
+    slope = dy @ dx / (dx * dx).sum()
+    intercept = mat.mean(axis=1) - slope * x.mean()
+    
+    ss_res = ((mat - (slope[:, None] * x + intercept[:, None])) ** 2).sum(axis=1)
+    ss_tot = (dy * dy).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.where(ss_res == 0, 1.0, 0.0))
+    return slope, intercept, r2
+
+
+def _run_trends(codes, offsets, qty, n_products):
+    """
+    Per-product OLS over the days each product actually sold, using
+    contiguous runs of flat arrays (no per-product DataFrames)
+    """
+    order = np.lexsort((offsets, codes))
+    codes, offsets, qty = codes[order], offsets[order], qty[order]
+    
+    # Collapse rows to (product, day) totals, then find each product's run
+    new_cell = np.r_[True, (np.diff(codes) != 0) | (np.diff(offsets) != 0)]
+    cell_starts = np.flatnonzero(new_cell)
+    day_qty = np.add.reduceat(qty, cell_starts).astype(np.float32)
+    day_code = codes[cell_starts]
+    day_x = offsets[cell_starts].astype(np.float32)
+    edges = np.r_[0, np.flatnonzero(np.diff(day_code)) + 1, day_code.size]
+    
+    slope = np.zeros(n_products, dtype=np.float64)
+    intercept = np.zeros(n_products, dtype=np.float64)
+    r2 = np.zeros(n_products, dtype=np.float64)
+    for s, e in zip(edges[:-1], edges[1:]):
+        c = day_code[s]
+        slope[c], intercept[c], r2[c] = linear_fit(day_x[s:e], day_qty[s:e])
+    return slope, intercept, r2
+
+
+def predict_future_demand_batch(df, days_to_predict=7, min_history=7, fill_gaps=True):
+    """
+    Linear trend forecast for every product in one vectorized pass
+    
+    Rows are summed per calendar day, with days counted from the first date
+    in the whole frame. With ``fill_gaps`` the fit runs over a dense
+    (products x days) matrix with zero-sales days filled in; without it, each
+    product is fitted only on the days it sold. Every product is forecast
+    from the day after the frame's last date. This differs from
+    predict_with_linear_regression, which fits one point per distinct
+    timestamp and forecasts from the product's own last sale.
+    Products with fewer than ``min_history`` sales rows are skipped, like the
+    single-product forecasts.
+    
+    Returns: (forecast_df, r2_series) or (None, None)
+        forecast_df has columns product_name, Date, Predicted_Sales
+    """
+    if df.empty:
+        return None, None
+    
+    # Drop the long tail before any per-day work: one pass of row counts
+    counts = df.groupby('product_name', observed=True, sort=False).size()
+    eligible = counts.index[counts >= min_history]
+    if len(eligible) < len(counts):
+        df = df[df['product_name'].isin(eligible)]
+    if df.empty:
+        return None, None
+    
+    dates = df['transaction_date']
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    day = dates.values.astype('datetime64[D]').view('int64')
+    first_day = day.min()
+    ndays = int(day.max() - first_day) + 1
+    
+    if ndays < 2:
+        return None, None
+    
+    # Flat arrays from here on: product code, day offset and quantity per row
+    codes, products = pd.factorize(df['product_name'], sort=True)
+    offsets = day - first_day
+    qty = df['quantity'].to_numpy(dtype=np.float64)
+    
+    if fill_gaps:
+        slope, intercept, r2 = _dense_trends(codes, offsets, qty, len(products), ndays)
+    else:
+        slope, intercept, r2 = _run_trends(codes, offsets, qty, len(products))
+    
+    future_x = np.arange(ndays, ndays + days_to_predict, dtype=np.float32)
+    predictions = np.maximum(slope[:, None] * future_x + intercept[:, None], 0)
+    
+    future_dates = pd.date_range(
+        pd.Timestamp(np.datetime64(int(first_day) + ndays, 'D')), periods=days_to_predict, freq='D'
+    )
+    # Typed columns up front: categorical names from codes, float32 predictions
+    forecast_df = pd.DataFrame({
+        'product_name': pd.Categorical.from_codes(
+            np.repeat(np.arange(len(products)), days_to_predict), categories=np.asarray(products)
+        ),
+        'Date': np.tile(future_dates.values, len(products)),
+        'Predicted_Sales': predictions.ravel().round(1).astype(np.float32, copy=False)
+    })
+    
+    return forecast_df, pd.Series(r2, index=products, name='r2')
 
 if __name__ == "__main__":
     print("🧪 Testing Prophet Model...")
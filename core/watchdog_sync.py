@@ -79,6 +79,17 @@ class CSVWatchdog:
         with open(filepath, 'rb') as f:
             return hashlib.md5(f.read()).hexdigest()
     
+    def read_csv(self, csv_file: Path) -> pd.DataFrame:
+        """
+        Read a billing export with Arrow's multithreaded CSV parser.
+        Falls back to pandas' default engine for files PyArrow can't handle.
+        """
+        try:
+            return pd.read_csv(csv_file, engine='pyarrow')
+        except Exception as e:
+            self.logger.warning(f"⚠️  PyArrow CSV engine failed ({e}), using default parser")
+            return pd.read_csv(csv_file)
+    
     def normalize_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normalize column names to match expected format.
@@ -237,10 +248,8 @@ class CSVWatchdog:
                     }
                     records.append(record)
                 
-                # Bulk insert
-                response = self.db.supabase.table('sales').insert(records).execute()
-                
-                batch_success = len(response.data) if response.data else 0
+                # Bulk insert (one multi-row insert for the batch)
+                batch_success = self.db.add_sales(records, source='watchdog', batch_size=batch_size)
                 success_count += batch_success
                 
                 # Progress indicator
@@ -283,7 +292,7 @@ class CSVWatchdog:
             
             # Read CSV
             self.logger.info("📖 Reading CSV file...")
-            df = pd.read_csv(csv_file)
+            df = self.read_csv(csv_file)
             self.logger.info(f"✅ Found {len(df)} rows, {len(df.columns)} columns")
             
             # Normalize column names
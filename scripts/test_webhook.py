@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
 from typing import Optional
 from datetime import datetime
+import functools
 import os
 from dotenv import load_dotenv
 
@@ -39,9 +40,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize managers
-db = KiranaDatabase()
-inventory = InventoryManager()
+# Managers are created on first use (not at import), then reused by every request
+@functools.lru_cache(maxsize=1)
+def get_db() -> KiranaDatabase:
+    return KiranaDatabase()
+
+@functools.lru_cache(maxsize=1)
+def get_inventory() -> InventoryManager:
+    return InventoryManager()
 
 # API Key for security
 API_KEY = os.getenv("WEBHOOK_API_KEY", "your_secret_key_12345")
@@ -191,10 +197,10 @@ async def receive_sale_webhook(
             'data_source': 'pos_webhook'
         }
         
-        sale_record = db.add_sale(sale_data, source='pos_webhook')
+        sale_record = get_db().add_sale(sale_data, source='pos_webhook')
         
         # Step 2: Deduct from inventory
-        success, message = inventory.deduct_stock_on_sale(
+        success, message = get_inventory().deduct_stock_on_sale(
             product_name=sale.product_name,
             store_code=sale.store_code,
             quantity=sale.quantity,
@@ -203,7 +209,7 @@ async def receive_sale_webhook(
         )
         
         # Step 3: Get updated stock level
-        stock_info = inventory.get_current_stock(sale.product_name, sale.store_code)
+        stock_info = get_inventory().get_current_stock(sale.product_name, sale.store_code)
         current_stock = stock_info['current_stock'] if stock_info else 0
         
         # Step 4: Check if low stock
@@ -243,7 +249,7 @@ async def receive_stock_inward(
     """
     try:
         # Add stock to inventory
-        success, message = inventory.add_stock_on_purchase(
+        success, message = get_inventory().add_stock_on_purchase(
             product_name=stock.product_name,
             store_code=stock.store_code,
             quantity=stock.quantity,
@@ -252,7 +258,7 @@ async def receive_stock_inward(
         )
         
         # Get updated stock
-        stock_info = inventory.get_current_stock(stock.product_name, stock.store_code)
+        stock_info = get_inventory().get_current_stock(stock.product_name, stock.store_code)
         current_stock = stock_info['current_stock'] if stock_info else 0
         
         return {
@@ -280,7 +286,7 @@ async def get_store_inventory(
 ):
     """Get current inventory levels for a store"""
     try:
-        stock_df = inventory.get_all_stock(store_code)
+        stock_df = get_inventory().get_all_stock(store_code)
         
         if stock_df.empty:
             return {"store_code": store_code, "items": []}
@@ -308,7 +314,7 @@ async def get_low_stock_items(
 ):
     """Get items that need reordering for a store"""
     try:
-        low_stock_df = inventory.get_low_stock_items(store_code)
+        low_stock_df = get_inventory().get_low_stock_items(store_code)
         
         if low_stock_df.empty:
             return {
@@ -336,7 +342,7 @@ async def get_low_stock_items(
 async def get_reorder_alerts(api_key: str = Depends(verify_api_key)):
     """Get all pending reorder alerts across all stores"""
     try:
-        alerts_df = inventory.get_reorder_alerts(status='PENDING')
+        alerts_df = get_inventory().get_reorder_alerts(status='PENDING')
         
         if alerts_df.empty:
             return {